@@ -2,16 +2,24 @@ from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import orjson
+from numba import njit
 import json
 import os
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from pydantic import BaseModel
 import sqlite3
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import StaticPool
 import logging
 from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
-from fastapi.responses import Response
+from cachetools import TTLCache
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 import uvicorn
 
 logging.basicConfig(level=logging.INFO)
@@ -20,15 +28,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Cloud-Native Data Platform API",
     description="REST API for accessing analytics and metrics from the data platform",
-    version="1.0.0"
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 REQUEST_COUNT = Counter('api_requests_total', 'Total API requests', ['method', 'endpoint', 'status'])
@@ -41,12 +42,26 @@ class DatabaseConnection:
     
     def setup_connection(self):
         try:
-            self.engine = create_engine('sqlite:///dataplatform.db')
+            self.engine = create_engine(
+                'sqlite:///dataplatform.db',
+                connect_args={"check_same_thread": False},
+                poolclass=StaticPool
+            )
+            event.listen(self.engine, "connect", self._set_sqlite_pragmas)
             logger.info("Database connection established")
         except Exception as e:
             logger.error(f"Database connection failed: {e}")
             self.engine = None
     
+    @staticmethod
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.close()
+    
     def get_connection(self):
         if self.engine:
             return self.engine
@@ -73,49 +88,326 @@ class CustomerSegment(BaseModel):
     avg_revenue: float
     percentage: float
 
+CACHED_PATHS = {
+    "/metrics/churn",
+    "/metrics/anomalies",
+    "/segments/high_value",
+    "/analytics/revenue",
+    "/analytics/customers"
+}
+RESPONSE_CACHE = TTLCache(maxsize=512, ttl=60)
+# Set on streamed responses so the cache passes them through instead of buffering the body;
+# the middleware strips it before the response leaves the app
+STREAMED_RESPONSE_HEADER = "x-streamed-response"
+# TTLCache is not thread-safe; reloads clear it from threadpool workers while the
+# middleware reads and writes it on the event loop
+_cache_lock = threading.Lock()
+_cache_generation = 0
+
+def invalidate_response_cache():
+    """Drop cached responses and reject bodies still being computed from the old data"""
+    global _cache_generation
+    with _cache_lock:
+        RESPONSE_CACHE.clear()
+        _cache_generation += 1
+
+@app.middleware("http")
+async def cache_responses(request, call_next):
+    if request.method != "GET" or request.url.path not in CACHED_PATHS:
+        return await call_next(request)
+    
+    cache_key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+    with _cache_lock:
+        cached = RESPONSE_CACHE.get(cache_key)
+        generation = _cache_generation
+    if cached is not None:
+        body, status_code, headers = cached
+        return Response(content=body, status_code=status_code, headers=headers)
+    
+    response = await call_next(request)
+    if STREAMED_RESPONSE_HEADER in response.headers:
+        # Internal marker only; keep it off the wire
+        del response.headers[STREAMED_RESPONSE_HEADER]
+        return response
+    if response.status_code != 200:
+        return response
+    
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    headers = dict(response.headers)
+    with _cache_lock:
+        # A reload during the request may mean the body was built from replaced data
+        if generation == _cache_generation:
+            RESPONSE_CACHE[cache_key] = (body, response.status_code, headers)
+    
+    return Response(content=body, status_code=response.status_code, headers=headers)
+
 @app.middleware("http")
 async def track_requests(request, call_next):
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     
     response = await call_next(request)
     
-    duration = (datetime.now() - start_time).total_seconds()
+    duration = time.perf_counter() - start_time
+    route = request.scope.get("route")
     REQUEST_DURATION.observe(duration)
     REQUEST_COUNT.labels(
         method=request.method,
-        endpoint=request.url.path,
+        endpoint=route.path if route else request.url.path,
         status=response.status_code
     ).inc()
     
     return response
 
+# Registered after the http middlewares so it runs outermost: CORS headers depend on the
+# caller's Origin and must be added per request, never stored with cached responses
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+DATA_PATH = '../data/raw/'
+CSV_FILES = ['customers.csv', 'transactions.csv', 'events.csv', 'products.csv']
+CSV_COLUMN_TYPES = {
+    'customers': {
+        'phone': pa.string(),
+        'registration_date': pa.timestamp('ns')
+    },
+    'transactions': {
+        'transaction_id': pa.string(),
+        'customer_id': pa.string(),
+        'transaction_date': pa.timestamp('ns'),
+        'amount': pa.float64()
+    }
+}
+CSV_BLOCK_SIZE = 64 << 20
+COLUMNAR_COLUMNS = {
+    'transactions': ['transaction_id', 'customer_id', 'transaction_date', 'amount']
+}
+# Written by generate_sample_data.save_partitioned_parquet; holds each row's position in the source file
+PARQUET_ROW_ORDER_COLUMN = 'row_number'
+
+def dataset_sources(dataset_name):
+    """Per-column .npy directory, partitioned Parquet directory and CSV path for a dataset"""
+    npy_path = os.path.join(DATA_PATH, f'{dataset_name}_npy')
+    parquet_path = os.path.join(DATA_PATH, f'{dataset_name}_parquet')
+    csv_path = os.path.join(DATA_PATH, f'{dataset_name}.csv')
+    return npy_path, parquet_path, csv_path
+
+def newest_dataset_source(dataset_name):
+    """Most recently written source for a dataset; .npy, then Parquet, wins ties with the CSV"""
+    npy_path, parquet_path, csv_path = dataset_sources(dataset_name)
+    candidates = [npy_path, parquet_path, csv_path] if dataset_name in COLUMNAR_COLUMNS else [csv_path]
+    existing = [path for path in candidates if os.path.exists(path)]
+    # Directory mtimes move with the generator's rmtree and os.replace, so the top level is enough
+    return max(existing, key=os.path.getmtime, default=None)
+
+def read_csv_arrow(csv_path, column_types=None):
+    """Parse a CSV with PyArrow's multi-threaded reader and hand the columns to pandas"""
+    table = pacsv.read_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE),
+        convert_options=pacsv.ConvertOptions(column_types=column_types or {})
+    )
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+def load_memmapped_columns(npy_path, columns):
+    """Build a DataFrame over memory-mapped .npy columns without copying the numeric ones"""
+    return pd.DataFrame(
+        {column: np.load(os.path.join(npy_path, f'{column}.npy'), mmap_mode='r') for column in columns},
+        copy=False
+    )
+
+def build_customer_aggregates(transactions_df):
+    """Per-customer transaction aggregates shared by the analytics endpoints"""
+    return transactions_df.groupby('customer_id', sort=False).agg(
+        transaction_count=('amount', 'count'),
+        total_spent=('amount', 'sum'),
+        avg_order_value=('amount', 'mean'),
+        first_purchase=('transaction_date', 'min'),
+        last_purchase=('transaction_date', 'max')
+    )
+
+def revenue_period_keys(day_keys, period):
+    """Map datetime64[D] day keys onto daily, weekly (Monday start) or monthly buckets"""
+    if period == "daily":
+        return day_keys
+    if period == "weekly":
+        # 1970-01-01 was a Thursday, so (days + 3) % 7 is the weekday with Monday = 0
+        return day_keys - (day_keys.astype(np.int64) + 3) % 7
+    return day_keys.astype('datetime64[M]')
+
+def format_period_labels(period_keys, period):
+    """Render bucket keys the same way pandas formats daily dates and W/M periods"""
+    if period == "daily":
+        return np.datetime_as_string(period_keys.astype('datetime64[D]'), unit='D')
+    if period == "weekly":
+        week_start = period_keys.astype('datetime64[D]')
+        return np.char.add(
+            np.char.add(np.datetime_as_string(week_start, unit='D'), '/'),
+            np.datetime_as_string(week_start + 6, unit='D')
+        )
+    return np.datetime_as_string(period_keys.astype('datetime64[M]'), unit='M')
+
+def dataframe_records(df):
+    """Convert a DataFrame to a list of row dicts of native Python values via Arrow"""
+    return pa.Table.from_pandas(df, preserve_index=False).to_pylist()
+
+# Serial on purpose: handlers run on a threadpool, and numba's default workqueue
+# threading layer aborts the process when parallel regions are entered concurrently
+@njit(cache=True)
+def anomaly_stats(amounts, sigmas):
+    """Mean, sample std and mean + sigmas * std threshold of the non-NaN amounts, like pandas"""
+    total = 0.0
+    n = 0
+    for i in range(amounts.shape[0]):
+        if not np.isnan(amounts[i]):
+            total += amounts[i]
+            n += 1
+    if n < 2:
+        return np.nan, np.nan, np.nan
+    mean = total / n
+    
+    squares = 0.0
+    for i in range(amounts.shape[0]):
+        if not np.isnan(amounts[i]):
+            squares += (amounts[i] - mean) ** 2
+    std = np.sqrt(squares / (n - 1))
+    
+    return mean, std, mean + sigmas * std
+
+# Compile once at import instead of on the first anomaly request, for both the in-memory
+# columns and the read-only memory-mapped .npy columns
+_warmup_amounts = np.zeros(2)
+anomaly_stats(_warmup_amounts, 3.0)
+_warmup_amounts.setflags(write=False)
+anomaly_stats(_warmup_amounts, 3.0)
+del _warmup_amounts
+
+STREAMING_ROW_THRESHOLD = 1000
+STREAMING_BATCH_ROWS = 256
+
+def streaming_metrics_response(data, records_key, records_df, message):
+    """Stream a MetricsResponse body whose records_key list is encoded one Arrow batch at a time"""
+    envelope = orjson.dumps(
+        {"success": True, "timestamp": datetime.now().isoformat(), "message": message, "data": data},
+        option=orjson.OPT_SERIALIZE_NUMPY
+    )
+    
+    def generate():
+        # "data" is the last key, so dropping the two closing braces leaves the data object open
+        yield envelope[:-2] + f',"{records_key}":['.encode()
+        separator = b''
+        for batch in pa.Table.from_pandas(records_df, preserve_index=False).to_batches(STREAMING_BATCH_ROWS):
+            yield separator + b','.join(orjson.dumps(row) for row in batch.to_pylist())
+            separator = b','
+        yield b']}}'
+    
+    return StreamingResponse(
+        generate(), media_type="application/json", headers={STREAMED_RESPONSE_HEADER: "1"}
+    )
+
+REVENUE_PERIODS = ("daily", "weekly", "monthly")
+
+def build_revenue_rollups(transactions_df, day_keys):
+    """Transaction count, revenue and unique customers per daily, weekly and monthly bucket"""
+    daily = transactions_df.groupby(day_keys).agg(
+        transactions=('amount', 'count'),
+        revenue=('amount', 'sum'),
+        unique_customers=('customer_id', 'nunique')
+    )
+    days = daily.index.values.astype('datetime64[D]')
+    
+    rollups = {}
+    for period in REVENUE_PERIODS:
+        if period == "daily":
+            rollup = daily.copy()
+        else:
+            # Counts and revenue add up from the daily table; distinct customers do not
+            rollup = daily[['transactions', 'revenue']].groupby(revenue_period_keys(days, period)).sum()
+            rollup['unique_customers'] = transactions_df.groupby(
+                revenue_period_keys(day_keys, period)
+            )['customer_id'].nunique()
+        rollup.index = pd.Index(format_period_labels(rollup.index.values, period), name='transaction_date')
+        rollups[period] = rollup
+    
+    return rollups
+
 def load_data():
     """Load data from CSV files or database"""
     try:
-        data_path = '../data/raw/'
         datasets = {}
         
-        csv_files = ['customers.csv', 'transactions.csv', 'events.csv', 'products.csv']
-        
-        for file in csv_files:
-            file_path = os.path.join(data_path, file)
-            if os.path.exists(file_path):
-                dataset_name = file.replace('.csv', '')
-                datasets[dataset_name] = pd.read_csv(file_path)
+        for file in CSV_FILES:
+            dataset_name = file.replace('.csv', '')
+            npy_path, parquet_path, csv_path = dataset_sources(dataset_name)
+            # An edited CSV must not be shadowed by columnar copies written before it
+            source = newest_dataset_source(dataset_name)
+            if source == npy_path:
+                datasets[dataset_name] = load_memmapped_columns(npy_path, COLUMNAR_COLUMNS[dataset_name])
+            elif source == parquet_path:
+                # Partitions come back grouped by month; sorting on the stored row number restores
+                # file order, so "recent" rows and aggregate tie order match the other formats
+                partitioned_df = pd.read_parquet(
+                    parquet_path,
+                    engine='pyarrow',
+                    columns=COLUMNAR_COLUMNS[dataset_name] + [PARQUET_ROW_ORDER_COLUMN]
+                )
+                datasets[dataset_name] = partitioned_df.sort_values(
+                    PARQUET_ROW_ORDER_COLUMN, ignore_index=True
+                ).drop(columns=PARQUET_ROW_ORDER_COLUMN)
+            elif source == csv_path:
+                datasets[dataset_name] = read_csv_arrow(csv_path, CSV_COLUMN_TYPES.get(dataset_name))
         
         if not datasets:
             logger.error("No data files found")
             return None
         
-        datasets['transactions']['transaction_date'] = pd.to_datetime(datasets['transactions']['transaction_date'])
-        datasets['customers']['registration_date'] = pd.to_datetime(datasets['customers']['registration_date'])
+        datasets['transaction_days'] = datasets['transactions']['transaction_date'].to_numpy().astype('datetime64[D]')
+        datasets['customer_agg'] = build_customer_aggregates(datasets['transactions'])
+        datasets['last_purchase_sorted'] = np.sort(datasets['customer_agg']['last_purchase'].to_numpy())
+        datasets['revenue_rollups'] = build_revenue_rollups(datasets['transactions'], datasets['transaction_days'])
         
         return datasets
     except Exception as e:
         logger.error(f"Error loading data: {e}")
         return None
 
-data = load_data()
+def data_files_mtime():
+    """Latest modification time across the source data files"""
+    mtimes = [
+        os.path.getmtime(path)
+        for file in CSV_FILES
+        for path in dataset_sources(file.replace('.csv', ''))
+        if os.path.exists(path)
+    ]
+    return max(mtimes, default=None)
+
+# Seconds between stats of the data sources; edits are picked up within this window
+DATA_RELOAD_CHECK_INTERVAL = 1.0
+_NOT_LOADED = object()
+_data_lock = threading.Lock()
+_loaded_data = (_NOT_LOADED, None)
+_next_reload_check = 0.0
+
+def get_data():
+    """Return the loaded datasets, reloading only when the source files change"""
+    global _loaded_data, _next_reload_check
+    now = time.monotonic()
+    if now < _next_reload_check:
+        return _loaded_data[1]
+    
+    # Stat the sources without the lock so handlers only serialize behind an actual reload
+    mtime = data_files_mtime()
+    if mtime != _loaded_data[0]:
+        with _data_lock:
+            if mtime != _loaded_data[0]:
+                invalidate_response_cache()
+                _loaded_data = (mtime, load_data())
+    _next_reload_check = now + DATA_RELOAD_CHECK_INTERVAL
+    return _loaded_data[1]
 
 @app.get("/")
 async def root():
@@ -128,8 +420,9 @@ async def root():
     }
 
 @app.get("/health")
-async def health_check():
+def health_check():
     """Health check endpoint"""
+    data = get_data()
     health_status = {
         "status": "healthy",
         "database": "connected" if db.engine else "disconnected",
@@ -143,32 +436,37 @@ async def health_check():
     return health_status
 
 @app.get("/metrics/churn", response_model=MetricsResponse)
-async def get_churn_metrics():
+def get_churn_metrics():
     """Get customer churn metrics"""
+    data = get_data()
     if not data:
         raise HTTPException(status_code=503, detail="Data not available")
     
     try:
         customers_df = data['customers']
-        transactions_df = data['transactions']
-        
-        current_date = datetime.now()
-        last_transaction = transactions_df.groupby('customer_id')['transaction_date'].max()
+        last_purchases = data['last_purchase_sorted']
         
-        days_since_last = (current_date - last_transaction).dt.days
+        current_date = np.datetime64(datetime.now())
         
         churn_threshold = 90
         at_risk_threshold = 60
         
-        churned = (days_since_last > churn_threshold).sum()
-        at_risk = ((days_since_last > at_risk_threshold) & (days_since_last <= churn_threshold)).sum()
+        # More than N whole days since the last purchase means it happened on or before now - (N + 1) days
+        churn_cutoff, at_risk_cutoff = np.searchsorted(
+            last_purchases,
+            [current_date - np.timedelta64(churn_threshold + 1, 'D'),
+             current_date - np.timedelta64(at_risk_threshold + 1, 'D')],
+            side='right'
+        )
+        churned = int(churn_cutoff)
+        at_risk = int(at_risk_cutoff - churn_cutoff)
         total_customers = len(customers_df)
         churn_rate = (churned / total_customers) * 100 if total_customers > 0 else 0
         
         churn_data = {
             "churn_rate": round(churn_rate, 2),
-            "churned_customers": int(churned),
-            "at_risk_customers": int(at_risk),
+            "churned_customers": churned,
+            "at_risk_customers": at_risk,
             "total_customers": total_customers,
             "active_customers": total_customers - churned,
             "churn_threshold_days": churn_threshold
@@ -185,48 +483,51 @@ async def get_churn_metrics():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/metrics/anomalies", response_model=MetricsResponse)
-async def get_anomaly_metrics():
+def get_anomaly_metrics():
     """Get transaction anomalies"""
+    data = get_data()
     if not data:
         raise HTTPException(status_code=503, detail="Data not available")
     
     try:
         transactions_df = data['transactions']
         
-        mean_amount = transactions_df['amount'].mean()
-        std_amount = transactions_df['amount'].std()
-        
-        threshold = mean_amount + (3 * std_amount)
+        amounts = transactions_df['amount'].to_numpy(dtype=np.float64)
+        _, _, threshold = anomaly_stats(amounts, 3.0)
         
-        anomalous_transactions = transactions_df[transactions_df['amount'] > threshold]
+        # NaN amounts and a NaN threshold compare False, so they are never flagged
+        anomalous = np.flatnonzero(amounts > threshold)
+        anomaly_count = len(anomalous)
+        anomaly_total = float(amounts[anomalous].sum())
+        anomalous_transactions = transactions_df.iloc[anomalous]
         
-        daily_counts = transactions_df.groupby(transactions_df['transaction_date'].dt.date).size()
+        _, daily_counts = np.unique(data['transaction_days'], return_counts=True)
         daily_mean = daily_counts.mean()
-        daily_std = daily_counts.std()
+        daily_std = daily_counts.std(ddof=1)
         
         daily_threshold_upper = daily_mean + (2 * daily_std)
         daily_threshold_lower = max(0, daily_mean - (2 * daily_std))
         
-        anomalous_days = daily_counts[
+        anomalous_days = np.count_nonzero(
             (daily_counts > daily_threshold_upper) | (daily_counts < daily_threshold_lower)
-        ]
+        )
         
         anomaly_data = {
             "large_transactions": {
-                "count": len(anomalous_transactions),
+                "count": anomaly_count,
                 "threshold": round(threshold, 2),
-                "total_value": round(anomalous_transactions['amount'].sum(), 2),
-                "avg_amount": round(anomalous_transactions['amount'].mean(), 2) if len(anomalous_transactions) > 0 else 0
+                "total_value": round(anomaly_total, 2),
+                "avg_amount": round(anomaly_total / anomaly_count, 2) if anomaly_count > 0 else 0
             },
             "daily_volume_anomalies": {
-                "anomalous_days": len(anomalous_days),
+                "anomalous_days": anomalous_days,
                 "upper_threshold": round(daily_threshold_upper, 2),
                 "lower_threshold": round(daily_threshold_lower, 2),
                 "normal_daily_range": f"{daily_mean - daily_std:.0f} - {daily_mean + daily_std:.0f}"
             },
-            "recent_anomalies": anomalous_transactions.tail(10)[
+            "recent_anomalies": dataframe_records(anomalous_transactions.tail(10)[
                 ['transaction_id', 'customer_id', 'amount', 'transaction_date']
-            ].to_dict('records') if len(anomalous_transactions) > 0 else []
+            ]) if len(anomalous_transactions) > 0 else []
         }
         
         return MetricsResponse(
@@ -240,24 +541,36 @@ async def get_anomaly_metrics():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/segments/high_value", response_model=MetricsResponse)
-async def get_high_value_customers():
+def get_high_value_customers():
     """Get high-value customer segments"""
+    data = get_data()
     if not data:
         raise HTTPException(status_code=503, detail="Data not available")
     
     try:
-        customers_df = data['customers']
-        transactions_df = data['transactions']
+        customer_spending = data['customer_agg'].reset_index()
+        
+        totals_sorted = np.sort(customer_spending['total_spent'].to_numpy())
+        total_customers = totals_sorted.size
         
-        customer_spending = transactions_df.groupby('customer_id').agg({
-            'amount': ['count', 'sum', 'mean'],
-            'transaction_date': ['min', 'max']
-        }).round(2)
+        spending_percentiles = [0.4, 0.6, 0.8, 0.95]
+        segment_names = ['Bronze', 'Silver', 'Gold', 'Platinum']
         
-        customer_spending.columns = ['transaction_count', 'total_spent', 'avg_order_value', 'first_purchase', 'last_purchase']
-        customer_spending = customer_spending.reset_index()
+        spending_cuts = np.quantile(totals_sorted, spending_percentiles)
+        segment_starts = np.searchsorted(totals_sorted, spending_cuts, side='left')
+        segment_ends = np.append(segment_starts[1:], total_customers)
+        segment_counts = segment_ends - segment_starts
         
-        high_value_threshold = customer_spending['total_spent'].quantile(0.8)
+        # Empty segments have zero width, so each non-empty segment ends where the next one starts
+        non_empty = segment_counts > 0
+        segment_sums = np.zeros(len(segment_names))
+        if non_empty.any():
+            offset = segment_starts[0]
+            segment_sums[non_empty] = np.add.reduceat(
+                totals_sorted[offset:], segment_starts[non_empty] - offset
+            )
+        
+        high_value_threshold = spending_cuts[2]
         
         high_value_customers = customer_spending[
             customer_spending['total_spent'] >= high_value_threshold
@@ -265,37 +578,24 @@ async def get_high_value_customers():
         
         customer_segments = []
         
-        spending_percentiles = [0.95, 0.8, 0.6, 0.4]
-        segment_names = ['Platinum', 'Gold', 'Silver', 'Bronze']
-        
-        for i, (percentile, name) in enumerate(zip(spending_percentiles, segment_names)):
-            if i == 0:
-                segment_customers = customer_spending[
-                    customer_spending['total_spent'] >= customer_spending['total_spent'].quantile(percentile)
-                ]
-            else:
-                prev_percentile = spending_percentiles[i-1]
-                segment_customers = customer_spending[
-                    (customer_spending['total_spent'] >= customer_spending['total_spent'].quantile(percentile)) &
-                    (customer_spending['total_spent'] < customer_spending['total_spent'].quantile(prev_percentile))
-                ]
-            
-            if len(segment_customers) > 0:
+        for k in reversed(range(len(segment_names))):
+            count = int(segment_counts[k])
+            if count > 0:
                 customer_segments.append({
-                    "segment": name,
-                    "customer_count": len(segment_customers),
-                    "avg_revenue": round(segment_customers['total_spent'].mean(), 2),
-                    "total_revenue": round(segment_customers['total_spent'].sum(), 2),
-                    "percentage": round((len(segment_customers) / len(customer_spending)) * 100, 2),
-                    "min_spend": round(segment_customers['total_spent'].min(), 2),
-                    "max_spend": round(segment_customers['total_spent'].max(), 2)
+                    "segment": segment_names[k],
+                    "customer_count": count,
+                    "avg_revenue": round(segment_sums[k] / count, 2),
+                    "total_revenue": round(segment_sums[k], 2),
+                    "percentage": round((count / total_customers) * 100, 2),
+                    "min_spend": round(totals_sorted[segment_starts[k]], 2),
+                    "max_spend": round(totals_sorted[segment_ends[k] - 1], 2)
                 })
         
         segment_data = {
             "high_value_threshold": round(high_value_threshold, 2),
             "total_high_value_customers": len(high_value_customers),
             "customer_segments": customer_segments,
-            "top_10_customers": high_value_customers.head(10).to_dict('records')
+            "top_10_customers": dataframe_records(high_value_customers.head(10).round(2))
         }
         
         return MetricsResponse(
@@ -309,41 +609,27 @@ async def get_high_value_customers():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/analytics/revenue", response_model=MetricsResponse)
-async def get_revenue_analytics(
+def get_revenue_analytics(
     period: str = Query("daily", description="Period for revenue analysis: daily, weekly, monthly")
 ):
     """Get revenue analytics by period"""
+    data = get_data()
     if not data:
         raise HTTPException(status_code=503, detail="Data not available")
     
     try:
         transactions_df = data['transactions']
         
-        if period == "daily":
-            revenue_data = transactions_df.groupby(transactions_df['transaction_date'].dt.date).agg({
-                'amount': ['count', 'sum', 'mean'],
-                'customer_id': 'nunique'
-            }).round(2)
-            revenue_data.columns = ['transactions', 'revenue', 'avg_order_value', 'unique_customers']
-        elif period == "weekly":
-            revenue_data = transactions_df.groupby(transactions_df['transaction_date'].dt.to_period('W')).agg({
-                'amount': ['count', 'sum', 'mean'],
-                'customer_id': 'nunique'
-            }).round(2)
-            revenue_data.columns = ['transactions', 'revenue', 'avg_order_value', 'unique_customers']
-        elif period == "monthly":
-            revenue_data = transactions_df.groupby(transactions_df['transaction_date'].dt.to_period('M')).agg({
-                'amount': ['count', 'sum', 'mean'],
-                'customer_id': 'nunique'
-            }).round(2)
-            revenue_data.columns = ['transactions', 'revenue', 'avg_order_value', 'unique_customers']
-        else:
+        if period not in REVENUE_PERIODS:
             raise HTTPException(status_code=400, detail="Invalid period. Use: daily, weekly, or monthly")
         
+        rollup = data['revenue_rollups'][period]
+        revenue_data = rollup.assign(
+            avg_order_value=rollup['revenue'] / rollup['transactions']
+        )[['transactions', 'revenue', 'avg_order_value', 'unique_customers']].round(2)
         revenue_data = revenue_data.reset_index()
-        revenue_data.iloc[:, 0] = revenue_data.iloc[:, 0].astype(str)
         
-        total_revenue = transactions_df['amount'].sum()
+        total_revenue = data['revenue_rollups']['daily']['revenue'].sum()
         total_transactions = len(transactions_df)
         
         analytics_data = {
@@ -351,45 +637,39 @@ async def get_revenue_analytics(
             "total_revenue": round(total_revenue, 2),
             "total_transactions": total_transactions,
             "data_points": len(revenue_data),
-            "revenue_trends": revenue_data.to_dict('records'),
             "summary": {
                 "avg_daily_revenue": round(revenue_data['revenue'].mean(), 2),
                 "peak_revenue_day": revenue_data.loc[revenue_data['revenue'].idxmax()].to_dict(),
                 "revenue_growth": round(((revenue_data['revenue'].iloc[-1] / revenue_data['revenue'].iloc[0]) - 1) * 100, 2) if len(revenue_data) > 1 else 0
             }
         }
+        message = f"Revenue analytics calculated for {period} period"
+        
+        if len(revenue_data) > STREAMING_ROW_THRESHOLD:
+            return streaming_metrics_response(analytics_data, "revenue_trends", revenue_data, message)
+        
+        analytics_data["revenue_trends"] = dataframe_records(revenue_data)
         
         return MetricsResponse(
             success=True,
             data=analytics_data,
             timestamp=datetime.now().isoformat(),
-            message=f"Revenue analytics calculated for {period} period"
+            message=message
         )
     except Exception as e:
         logger.error(f"Error calculating revenue analytics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/analytics/customers", response_model=MetricsResponse)
-async def get_customer_analytics():
+def get_customer_analytics():
     """Get comprehensive customer analytics"""
+    data = get_data()
     if not data:
         raise HTTPException(status_code=503, detail="Data not available")
     
     try:
         customers_df = data['customers']
-        transactions_df = data['transactions']
-        
-        customer_metrics = transactions_df.groupby('customer_id').agg({
-            'amount': ['count', 'sum', 'mean'],
-            'transaction_date': ['min', 'max']
-        }).round(2)
-        
-        customer_metrics.columns = ['transaction_count', 'total_spent', 'avg_order_value', 'first_purchase', 'last_purchase']
-        
-        current_date = datetime.now()
-        customer_metrics['days_since_last_purchase'] = (
-            current_date - pd.to_datetime(customer_metrics['last_purchase'])
-        ).dt.days
+        customer_metrics = data['customer_agg']
         
         age_groups = customers_df['age'].value_counts().sort_index() if 'age' in customers_df.columns else {}
         
@@ -429,9 +709,10 @@ async def prometheus_metrics():
     return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 @app.get("/api/status")
-async def api_status():
+def api_status():
     """API status and statistics"""
     try:
+        data = get_data()
         status_info = {
             "api_version": "1.0.0",
             "uptime": datetime.now().isoformat(),
@@ -1,10 +1,16 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import sqlite3
-from sqlalchemy import create_engine, text, MetaData, Table, Column, String, Integer, Float, DateTime, Boolean
+from sqlalchemy import create_engine, event, inspect, text, MetaData, Table, Column, Computed, Index, String, Integer, Float, DateTime, Boolean
 import os
+import sys
 import logging
 from datetime import datetime
 import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,203 +21,472 @@ class DatabaseSetup:
         self.connection_string = connection_string or 'sqlite:///dataplatform.db'
         self.engine = None
         self.setup_connection()
+        self.metadata = self._define_tables()
     
     def setup_connection(self):
         """Setup database connection"""
         try:
             self.engine = create_engine(self.connection_string, echo=False)
+            if self.engine.dialect.name == 'sqlite':
+                event.listen(self.engine, "connect", self._set_sqlite_pragmas)
             logger.info(f"Database connection established: {self.db_type}")
         except Exception as e:
             logger.error(f"Database connection failed: {e}")
             raise
     
+    @staticmethod
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Tune every new SQLite connection for bulk loading and analytics reads"""
+        cursor = dbapi_connection.cursor()
+        cursor.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA cache_size=-65536;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=2147483648;
+            PRAGMA busy_timeout=5000;
+        """)
+        cursor.close()
+    
+    def _define_tables(self):
+        """Declare the table schemas once per instance so create_tables can be re-run"""
+        metadata = MetaData()
+        
+        # Hot tables key on an INTEGER PRIMARY KEY (the rowid itself) and keep the
+        # textual id as a secondary unique index
+        customers_table = Table(
+            'customers', metadata,
+            Column('id', Integer, primary_key=True, autoincrement=True),
+            Column('customer_id', String(20), nullable=False),
+            Column('first_name', String(50)),
+            Column('last_name', String(50)),
+            Column('email', String(100)),
+            Column('phone', String(20)),
+            Column('registration_date', DateTime),
+            Column('age', Integer),
+            Column('city', String(50)),
+            Column('state', String(10)),
+            Column('segment', String(20)),
+            Column('is_active', Boolean),
+            Index('idx_customers_customer_id', 'customer_id', unique=True)
+        )
+        
+        transactions_table = Table(
+            'transactions', metadata,
+            Column('id', Integer, primary_key=True, autoincrement=True),
+            Column('transaction_id', String(20), nullable=False),
+            Column('customer_id', String(20)),
+            Column('transaction_date', DateTime),
+            Column('amount', Float),
+            Column('currency', String(5)),
+            Column('transaction_type', String(20)),
+            Column('merchant', String(50)),
+            Column('category', String(30)),
+            Column('payment_method', String(20)),
+            Column('status', String(20)),
+            Index('idx_transactions_transaction_id', 'transaction_id', unique=True)
+        )
+        if self.engine.dialect.name == 'sqlite':
+            # Month bucket stored at insert time so monthly roll-ups group on a plain column;
+            # the substr relies on SQLite keeping DATETIME values as ISO text
+            transactions_table.append_column(
+                Column('month', String(7), Computed("substr(transaction_date, 1, 7)", persisted=True))
+            )
+        
+        events_table = Table(
+            'events', metadata,
+            Column('id', Integer, primary_key=True, autoincrement=True),
+            Column('event_id', String(20), nullable=False),
+            Column('customer_id', String(20)),
+            Column('timestamp', DateTime),
+            Column('event_type', String(30)),
+            Column('page_url', String(100)),
+            Column('session_id', String(20)),
+            Column('device_type', String(20)),
+            Column('browser', String(20)),
+            Column('ip_address', String(15)),
+            Column('user_agent', String(200)),
+            Index('idx_events_event_id', 'event_id', unique=True)
+        )
+        
+        # The small catalog is clustered directly on its natural key
+        products_table = Table(
+            'products', metadata,
+            Column('product_id', String(20), primary_key=True),
+            Column('name', String(100)),
+            Column('category', String(30)),
+            Column('subcategory', String(50)),
+            Column('price', Float),
+            Column('cost', Float),
+            Column('stock_quantity', Integer),
+            Column('supplier', String(50)),
+            Column('created_date', DateTime),
+            Column('is_active', Boolean),
+            Column('weight_kg', Float),
+            Column('dimensions', String(50)),
+            sqlite_with_rowid=False
+        )
+        
+        return metadata
+    
     def create_tables(self):
         """Create database tables with proper schemas"""
         try:
-            metadata = MetaData()
-            
-            customers_table = Table(
-                'customers', metadata,
-                Column('customer_id', String(20), primary_key=True),
-                Column('first_name', String(50)),
-                Column('last_name', String(50)),
-                Column('email', String(100)),
-                Column('phone', String(20)),
-                Column('registration_date', DateTime),
-                Column('age', Integer),
-                Column('city', String(50)),
-                Column('state', String(10)),
-                Column('segment', String(20)),
-                Column('is_active', Boolean)
-            )
-            
-            transactions_table = Table(
-                'transactions', metadata,
-                Column('transaction_id', String(20), primary_key=True),
-                Column('customer_id', String(20)),
-                Column('transaction_date', DateTime),
-                Column('amount', Float),
-                Column('currency', String(5)),
-                Column('transaction_type', String(20)),
-                Column('merchant', String(50)),
-                Column('category', String(30)),
-                Column('payment_method', String(20)),
-                Column('status', String(20))
-            )
-            
-            events_table = Table(
-                'events', metadata,
-                Column('event_id', String(20), primary_key=True),
-                Column('customer_id', String(20)),
-                Column('timestamp', DateTime),
-                Column('event_type', String(30)),
-                Column('page_url', String(100)),
-                Column('session_id', String(20)),
-                Column('device_type', String(20)),
-                Column('browser', String(20)),
-                Column('ip_address', String(15)),
-                Column('user_agent', String(200))
-            )
-            
-            products_table = Table(
-                'products', metadata,
-                Column('product_id', String(20), primary_key=True),
-                Column('name', String(100)),
-                Column('category', String(30)),
-                Column('subcategory', String(50)),
-                Column('price', Float),
-                Column('cost', Float),
-                Column('stock_quantity', Integer),
-                Column('supplier', String(50)),
-                Column('created_date', DateTime),
-                Column('is_active', Boolean),
-                Column('weight_kg', Float),
-                Column('dimensions', String(50))
-            )
-            
-            metadata.create_all(self.engine)
+            self.metadata.create_all(self.engine)
             logger.info("Database tables created successfully")
             
         except Exception as e:
             logger.error(f"Error creating tables: {e}")
             raise
     
-    def load_csv_to_database(self, csv_path, table_name, if_exists='replace'):
+    # Column types of the generated CSV files, converted while the CSV is tokenized
+    CSV_SCHEMAS = {
+        'customers': pa.schema([
+            ('customer_id', pa.string()),
+            ('first_name', pa.string()),
+            ('last_name', pa.string()),
+            ('email', pa.string()),
+            ('phone', pa.string()),
+            ('registration_date', pa.timestamp('ns')),
+            ('age', pa.int64()),
+            ('city', pa.string()),
+            ('state', pa.string()),
+            ('segment', pa.string()),
+            ('is_active', pa.bool_())
+        ]),
+        'transactions': pa.schema([
+            ('transaction_id', pa.string()),
+            ('customer_id', pa.string()),
+            ('transaction_date', pa.timestamp('ns')),
+            ('amount', pa.float64()),
+            ('currency', pa.string()),
+            ('transaction_type', pa.string()),
+            ('merchant', pa.string()),
+            ('category', pa.string()),
+            ('payment_method', pa.string()),
+            ('status', pa.string())
+        ]),
+        'events': pa.schema([
+            ('event_id', pa.string()),
+            ('customer_id', pa.string()),
+            ('timestamp', pa.timestamp('ns')),
+            ('event_type', pa.string()),
+            ('page_url', pa.string()),
+            ('session_id', pa.string()),
+            ('device_type', pa.string()),
+            ('browser', pa.string()),
+            ('ip_address', pa.string()),
+            ('user_agent', pa.string())
+        ]),
+        'products': pa.schema([
+            ('product_id', pa.string()),
+            ('name', pa.string()),
+            ('category', pa.string()),
+            ('subcategory', pa.string()),
+            ('price', pa.float64()),
+            ('cost', pa.float64()),
+            ('stock_quantity', pa.int64()),
+            ('supplier', pa.string()),
+            ('created_date', pa.timestamp('ns')),
+            ('is_active', pa.bool_()),
+            ('weight_kg', pa.float64()),
+            ('dimensions', pa.string())
+        ])
+    }
+    
+    def load_csv_to_database(self, csv_path, table_name, if_exists='replace', conn=None):
         """Load CSV data into database table"""
         try:
-            df = pd.read_csv(csv_path)
-            
-            if table_name == 'customers':
-                df['registration_date'] = pd.to_datetime(df['registration_date'])
-                df['is_active'] = df['is_active'].astype(bool)
-            elif table_name == 'transactions':
-                df['transaction_date'] = pd.to_datetime(df['transaction_date'])
-            elif table_name == 'events':
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-            elif table_name == 'products':
-                df['created_date'] = pd.to_datetime(df['created_date'])
-                df['is_active'] = df['is_active'].astype(bool)
-            
-            df.to_sql(table_name, self.engine, if_exists=if_exists, index=False)
-            logger.info(f"Loaded {len(df)} records into {table_name} table")
+            df = self._read_csv(csv_path, table_name)
+            self._write_dataframe(df, table_name, if_exists, conn)
             
         except Exception as e:
             logger.error(f"Error loading {csv_path} to {table_name}: {e}")
             raise
     
+    def load_parquet_to_database(self, parquet_path, table_name, if_exists='replace', conn=None):
+        """Load a Parquet file into database table"""
+        try:
+            df = self._read_parquet(parquet_path)
+            self._write_dataframe(df, table_name, if_exists, conn)
+            
+        except Exception as e:
+            logger.error(f"Error loading {parquet_path} to {table_name}: {e}")
+            raise
+    
+    def _read_csv(self, csv_path, table_name):
+        """Parse a CSV file into a typed DataFrame"""
+        # Timestamps and booleans are typed during tokenizing instead of in later pandas passes
+        convert_options = pacsv.ConvertOptions(column_types=self.CSV_SCHEMAS.get(table_name, {}))
+        return pacsv.read_csv(csv_path, convert_options=convert_options).to_pandas()
+    
+    @staticmethod
+    def _read_parquet(parquet_path):
+        """Read a Parquet file into a DataFrame"""
+        # Types come from the file schema, so there is nothing to parse or coerce
+        return pq.read_table(parquet_path, memory_map=True).to_pandas()
+    
+    def _read_data_file(self, data_path, table_name):
+        """Read the newer of a table's Parquet and CSV files; None when neither exists"""
+        parquet_path = os.path.join(data_path, f'{table_name}.parquet')
+        csv_path = os.path.join(data_path, f'{table_name}.csv')
+        try:
+            # Parquet wins ties, but an edited CSV must not be shadowed by an older Parquet copy
+            if os.path.exists(parquet_path) and (
+                not os.path.exists(csv_path) or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)
+            ):
+                return self._read_parquet(parquet_path)
+            if os.path.exists(csv_path):
+                return self._read_csv(csv_path, table_name)
+        except Exception as e:
+            logger.error(f"Error reading {table_name} data from {data_path}: {e}")
+            raise
+        
+        logger.warning(f"File not found: {csv_path}")
+        return None
+    
+    @contextmanager
+    def _load_transaction(self):
+        """Connection holding one write transaction for everything loaded through it"""
+        is_sqlite = self.engine.dialect.name == 'sqlite'
+        with self.engine.connect() as conn:
+            if is_sqlite:
+                # Take the writer lock once for all tables and check foreign keys only at commit
+                conn.exec_driver_sql("PRAGMA synchronous=OFF")
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+                conn.exec_driver_sql("PRAGMA defer_foreign_keys=1")
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                if is_sqlite:
+                    conn.exec_driver_sql("PRAGMA synchronous=NORMAL")
+    
+    def _write_dataframe(self, df, table_name, if_exists='replace', conn=None):
+        """Write a typed DataFrame into a database table"""
+        if conn is None:
+            with self._load_transaction() as conn:
+                self._write_dataframe(df, table_name, if_exists, conn)
+            return
+        
+        if table_name in self.metadata.tables and if_exists == 'replace':
+            # Rebuild from the declared schema (keys, WITHOUT ROWID, generated columns) so a
+            # table left behind by an older setup cannot keep its stale layout
+            table = self.metadata.tables[table_name]
+            table.drop(conn, checkfirst=True)
+            table.create(conn)
+            if_exists = 'append'
+        
+        if self.engine.dialect.name == 'sqlite':
+            # Let pandas create (or replace) an undeclared table's schema, then bulk insert the rows
+            df.head(0).to_sql(table_name, conn, if_exists=if_exists, index=False)
+            self._bulk_insert_sqlite(df, table_name, conn)
+        else:
+            df.to_sql(table_name, conn, if_exists=if_exists, index=False)
+        logger.info(f"Loaded {len(df)} records into {table_name} table")
+    
+    def _bulk_insert_sqlite(self, df, table_name, conn):
+        """Insert all rows with a single executemany inside the caller's transaction"""
+        df = df.copy()
+        for col in df.select_dtypes(include=['datetime64']).columns:
+            # Same text format SQLAlchemy uses for SQLite DATETIME columns
+            df[col] = df[col].dt.strftime('%Y-%m-%d %H:%M:%S.%f').where(df[col].notna(), None)
+        
+        columns = ', '.join(f'"{col}"' for col in df.columns)
+        placeholders = ', '.join('?' for _ in df.columns)
+        insert_sql = f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholders})'
+        
+        cursor = conn.connection.driver_connection.cursor()
+        try:
+            cursor.executemany(insert_sql, df.itertuples(index=False, name=None))
+        finally:
+            cursor.close()
+    
     def load_all_data(self, data_path='../data/raw/'):
-        """Load all CSV files into database"""
-        csv_files = {
-            'customers.csv': 'customers',
-            'transactions.csv': 'transactions', 
-            'events.csv': 'events',
-            'products.csv': 'products'
-        }
+        """Load all data files into database, preferring Parquet over CSV"""
+        tables = ['customers', 'transactions', 'events', 'products']
         
-        for csv_file, table_name in csv_files.items():
-            file_path = os.path.join(data_path, csv_file)
-            if os.path.exists(file_path):
-                self.load_csv_to_database(file_path, table_name)
-            else:
-                logger.warning(f"File not found: {file_path}")
+        # Parse the files concurrently (Arrow releases the GIL); SQLite has a single
+        # writer, so the inserts then run one table after another in one transaction
+        with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+            frames = list(executor.map(lambda table_name: self._read_data_file(data_path, table_name), tables))
+        
+        with self._load_transaction() as conn:
+            for table_name, df in zip(tables, frames):
+                if df is not None:
+                    self._write_dataframe(df, table_name, conn=conn)
+    
+    def load_from_generators(self):
+        """Generate the sample datasets in-process and load them without a file round-trip"""
+        repo_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+        if repo_root not in sys.path:
+            sys.path.insert(0, repo_root)
+        from data.raw.generate_sample_data import (
+            generate_customers, generate_transactions, generate_events, generate_products
+        )
+        
+        datasets = [
+            (generate_customers, 'customers', 'registration_date'),
+            (generate_transactions, 'transactions', 'transaction_date'),
+            (generate_events, 'events', 'timestamp'),
+            (generate_products, 'products', 'created_date')
+        ]
+        
+        with self._load_transaction() as conn:
+            for generate, table_name, date_column in datasets:
+                try:
+                    df = generate()
+                    df[date_column] = pd.to_datetime(df[date_column])
+                    self._write_dataframe(df, table_name, conn=conn)
+                except Exception as e:
+                    logger.error(f"Error loading generated {table_name}: {e}")
+                    raise
+    
+    def _execute_ddl_batch(self, statements):
+        """Run DDL statements in a single transaction so they share one commit"""
+        if self.engine.dialect.name == 'sqlite':
+            # pysqlite does not open a transaction for DDL on its own, so BEGIN/COMMIT explicitly
+            raw_conn = self.engine.raw_connection()
+            try:
+                raw_conn.driver_connection.executescript(
+                    "BEGIN;\n" + ";\n".join(statements) + ";\nCOMMIT;"
+                )
+            finally:
+                raw_conn.close()
+        else:
+            with self.engine.begin() as conn:
+                for statement in statements:
+                    conn.execute(text(statement))
+    
+    # Analytics roll-ups stored as tables: name -> (lookup column, SELECT with a {month} bucket)
+    MATERIALIZED_VIEWS = {
+        'customer_summary': ('customer_id', '''
+            SELECT 
+                c.customer_id,
+                c.first_name,
+                c.last_name,
+                c.segment,
+                c.registration_date,
+                COUNT(t.transaction_id) as total_transactions,
+                COALESCE(SUM(t.amount), 0) as total_spent,
+                COALESCE(AVG(t.amount), 0) as avg_order_value,
+                MIN(t.transaction_date) as first_purchase,
+                MAX(t.transaction_date) as last_purchase
+            FROM customers c
+            LEFT JOIN transactions t ON c.customer_id = t.customer_id
+            GROUP BY c.customer_id, c.first_name, c.last_name, c.segment, c.registration_date
+        '''),
+        
+        'daily_metrics': ('date', '''
+            SELECT 
+                DATE(transaction_date) as date,
+                COUNT(*) as daily_transactions,
+                SUM(amount) as daily_revenue,
+                AVG(amount) as avg_transaction_value,
+                COUNT(DISTINCT customer_id) as unique_customers
+            FROM transactions
+            WHERE status = 'completed'
+            GROUP BY DATE(transaction_date)
+            ORDER BY date
+        '''),
+        
+        'monthly_trends': ('month', '''
+            SELECT 
+                {month} as month,
+                COUNT(*) as monthly_transactions,
+                SUM(amount) as monthly_revenue,
+                COUNT(DISTINCT customer_id) as unique_customers,
+                AVG(amount) as avg_order_value
+            FROM transactions
+            WHERE status = 'completed'
+            GROUP BY {month}
+            ORDER BY month
+        ''')
+    }
+    
+    def _month_bucket_sql(self):
+        """SQL for a transaction's YYYY-MM bucket: the stored column on SQLite, else an expression"""
+        if 'month' in self.metadata.tables['transactions'].c:
+            return 'month'
+        return "substr(CAST(transaction_date AS TEXT), 1, 7)"
     
     def create_views(self):
-        """Create useful database views for analytics"""
+        """Create the analytics roll-ups as materialized tables"""
+        self.refresh_materialized()
+    
+    def refresh_materialized(self):
+        """Rebuild the materialized analytics tables from the current base tables"""
         try:
-            views = {
-                'customer_summary': '''
-                    CREATE VIEW IF NOT EXISTS customer_summary AS
-                    SELECT 
-                        c.customer_id,
-                        c.first_name,
-                        c.last_name,
-                        c.segment,
-                        c.registration_date,
-                        COUNT(t.transaction_id) as total_transactions,
-                        COALESCE(SUM(t.amount), 0) as total_spent,
-                        COALESCE(AVG(t.amount), 0) as avg_order_value,
-                        MIN(t.transaction_date) as first_purchase,
-                        MAX(t.transaction_date) as last_purchase
-                    FROM customers c
-                    LEFT JOIN transactions t ON c.customer_id = t.customer_id
-                    GROUP BY c.customer_id, c.first_name, c.last_name, c.segment, c.registration_date
-                ''',
-                
-                'daily_metrics': '''
-                    CREATE VIEW IF NOT EXISTS daily_metrics AS
-                    SELECT 
-                        DATE(transaction_date) as date,
-                        COUNT(*) as daily_transactions,
-                        SUM(amount) as daily_revenue,
-                        AVG(amount) as avg_transaction_value,
-                        COUNT(DISTINCT customer_id) as unique_customers
-                    FROM transactions
-                    WHERE status = 'completed'
-                    GROUP BY DATE(transaction_date)
-                    ORDER BY date
-                ''',
-                
-                'monthly_trends': '''
-                    CREATE VIEW IF NOT EXISTS monthly_trends AS
-                    SELECT 
-                        strftime('%Y-%m', transaction_date) as month,
-                        COUNT(*) as monthly_transactions,
-                        SUM(amount) as monthly_revenue,
-                        COUNT(DISTINCT customer_id) as unique_customers,
-                        AVG(amount) as avg_order_value
-                    FROM transactions
-                    WHERE status = 'completed'
-                    GROUP BY strftime('%Y-%m', transaction_date)
-                    ORDER BY month
-                '''
-            }
-            
             with self.engine.connect() as conn:
-                for view_name, view_sql in views.items():
-                    conn.execute(text(view_sql))
-                    conn.commit()
-                    logger.info(f"Created view: {view_name}")
+                existing_views = set(inspect(conn).get_view_names())
+            
+            month = self._month_bucket_sql()
+            statements = []
+            for view_name, (key_column, select_sql) in self.MATERIALIZED_VIEWS.items():
+                select_sql = select_sql.format(month=month)
+                if view_name in existing_views:
+                    statements.append(f"DROP VIEW {view_name}")
+                statements.append(f"DROP TABLE IF EXISTS {view_name}")
+                statements.append(f"CREATE TABLE {view_name} AS {select_sql}")
+                statements.append(f"CREATE INDEX idx_{view_name}_{key_column} ON {view_name}({key_column})")
+            
+            self._execute_ddl_batch(statements)
+            logger.info(f"Materialized views: {', '.join(self.MATERIALIZED_VIEWS)}")
                     
         except Exception as e:
-            logger.error(f"Error creating views: {e}")
+            logger.error(f"Error materializing views: {e}")
             raise
     
+    # Secondary indexes for the analytics queries: name -> indexed table and columns.
+    # The covering ones serve the completed-transaction roll-ups and product performance;
+    # SQLite only treats a partial index as covering when it also holds the filtered column
+    ANALYTICS_INDEXES = {
+        'idx_transactions_customer_id': "transactions(customer_id)",
+        'idx_transactions_date': "transactions(transaction_date)",
+        'idx_transactions_amount': "transactions(amount)",
+        'idx_customers_segment': "customers(segment)",
+        'idx_events_customer_id': "events(customer_id)",
+        'idx_events_timestamp': "events(timestamp)",
+        'idx_txn_completed': "transactions(transaction_date, customer_id, amount, status) WHERE status = 'completed'",
+        'idx_txn_category_amount': "transactions(category, amount)"
+    }
+    
+    # SQLite-only indexes: the stored month column, and a partial index whose predicate
+    # matches queries written as is_active = 1 (boolean = integer is an error on PostgreSQL)
+    SQLITE_ANALYTICS_INDEXES = {
+        'idx_txn_month': "transactions(month, status, customer_id, amount)",
+        'idx_customers_segment_active': "customers(segment) WHERE is_active = 1"
+    }
+    
+    def _analytics_indexes(self):
+        """Analytics indexes that apply to the connected database"""
+        if self.engine.dialect.name == 'sqlite':
+            return {**self.ANALYTICS_INDEXES, **self.SQLITE_ANALYTICS_INDEXES}
+        return self.ANALYTICS_INDEXES
+    
+    def _drop_analytics_indexes(self):
+        """Drop the analytics indexes so a bulk load does not maintain them row by row"""
+        self._execute_ddl_batch(
+            [f"DROP INDEX IF EXISTS {name}" for name in self._analytics_indexes()]
+        )
+    
     def create_indexes(self):
         """Create database indexes for better performance"""
         try:
             indexes = [
-                "CREATE INDEX IF NOT EXISTS idx_transactions_customer_id ON transactions(customer_id)",
-                "CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(transaction_date)",
-                "CREATE INDEX IF NOT EXISTS idx_transactions_amount ON transactions(amount)",
-                "CREATE INDEX IF NOT EXISTS idx_customers_segment ON customers(segment)",
-                "CREATE INDEX IF NOT EXISTS idx_events_customer_id ON events(customer_id)",
-                "CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events(timestamp)"
+                f"CREATE INDEX IF NOT EXISTS {name} ON {definition}"
+                for name, definition in self._analytics_indexes().items()
             ]
+            indexes.append("ANALYZE")
             
-            with self.engine.connect() as conn:
-                for index_sql in indexes:
-                    conn.execute(text(index_sql))
-                    conn.commit()
+            self._execute_ddl_batch(indexes)
+            
+            if self.engine.dialect.name == 'sqlite':
+                with self.engine.connect() as conn:
+                    conn.execute(text("PRAGMA optimize"))
                     
             logger.info("Database indexes created successfully")
                     
@@ -224,27 +499,26 @@ class DatabaseSetup:
         try:
             quality_checks = {}
             
+            # Extra counts per table, all evaluated in the same scan as COUNT(*)
+            tables_to_check = {
+                'customers': {"null_emails": "email IS NULL OR email = ''"},
+                'transactions': {
+                    "negative_amounts": "amount < 0",
+                    "null_customer_ids": "customer_id IS NULL"
+                },
+                'events': {},
+                'products': {}
+            }
+            
             with self.engine.connect() as conn:
-                tables_to_check = ['customers', 'transactions', 'events', 'products']
-                
-                for table in tables_to_check:
-                    result = conn.execute(text(f"SELECT COUNT(*) FROM {table}"))
-                    count = result.scalar()
-                    quality_checks[f"{table}_count"] = count
+                for table, conditions in tables_to_check.items():
+                    counts = ''.join(
+                        f", COUNT(CASE WHEN {condition} THEN 1 END)" for condition in conditions.values()
+                    )
+                    row = conn.execute(text(f"SELECT COUNT(*){counts} FROM {table}")).one()
                     
-                    if table == 'transactions':
-                        result = conn.execute(text("SELECT COUNT(*) FROM transactions WHERE amount < 0"))
-                        negative_amounts = result.scalar()
-                        quality_checks["negative_amounts"] = negative_amounts
-                        
-                        result = conn.execute(text("SELECT COUNT(*) FROM transactions WHERE customer_id IS NULL"))
-                        null_customers = result.scalar()
-                        quality_checks["null_customer_ids"] = null_customers
-                    
-                    if table == 'customers':
-                        result = conn.execute(text("SELECT COUNT(*) FROM customers WHERE email IS NULL OR email = ''"))
-                        null_emails = result.scalar()
-                        quality_checks["null_emails"] = null_emails
+                    quality_checks[f"{table}_count"] = row[0]
+                    quality_checks.update(zip(conditions, row[1:]))
                 
                 logger.info("Data quality validation completed")
                 return quality_checks
@@ -303,25 +577,32 @@ class DatabaseSetup:
         }
         
         queries_path = '../app/queries.sql'
+        parts = ["-- Sample Analytics Queries for Cloud-Native Data Platform\n\n"]
+        parts.extend(
+            f"-- {query_name.replace('_', ' ').title()}\n{query_sql}\n\n"
+            for query_name, query_sql in queries.items()
+        )
         with open(queries_path, 'w') as f:
-            f.write("-- Sample Analytics Queries for Cloud-Native Data Platform\\n\\n")
-            for query_name, query_sql in queries.items():
-                f.write(f"-- {query_name.replace('_', ' ').title()}\\n")
-                f.write(f"{query_sql}\\n\\n")
+            f.write("".join(parts))
         
         logger.info(f"Sample queries exported to {queries_path}")
         
         return queries
     
-    def setup_database(self, data_path='../data/raw/'):
+    def setup_database(self, data_path='../data/raw/', from_generators=False):
         """Complete database setup process"""
         try:
             logger.info("Starting database setup...")
             
             self.create_tables()
-            self.load_all_data(data_path)
-            self.create_views()
+            # Load into unindexed tables, then build each index once over the full data
+            self._drop_analytics_indexes()
+            if from_generators:
+                self.load_from_generators()
+            else:
+                self.load_all_data(data_path)
             self.create_indexes()
+            self.create_views()
             
             quality_report = self.validate_data_quality()
             logger.info(f"Data quality report: {quality_report}")
@@ -1,106 +1,167 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import random
+import pyarrow as pa
+import pyarrow.parquet as pq
 import json
+import os
+import shutil
+
+# Value vocabularies, built once and reused by every generator call
+FIRST_NAMES = np.array(['John', 'Jane', 'Mike', 'Sarah', 'David', 'Emma', 'Chris', 'Lisa'])
+LAST_NAMES = np.array(['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis'])
+CITIES = np.array(['New York', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix', 'Philadelphia', 'San Antonio', 'San Diego'])
+STATES = np.array(['CA', 'TX', 'NY', 'FL', 'IL', 'PA', 'OH', 'GA'])
+SEGMENTS = np.array(['Bronze', 'Silver', 'Gold', 'Platinum'])
+CURRENCIES = np.array(['USD', 'EUR', 'GBP'])
+TRANSACTION_TYPES = np.array(['purchase', 'refund', 'transfer', 'deposit'])
+MERCHANTS = np.array(['Amazon', 'Walmart', 'Target', 'Best Buy', 'Costco', 'Home Depot', 'Starbucks', 'McDonald\'s'])
+TRANSACTION_CATEGORIES = np.array(['retail', 'food', 'entertainment', 'utilities', 'healthcare', 'transportation'])
+PAYMENT_METHODS = np.array(['credit_card', 'debit_card', 'paypal', 'bank_transfer'])
+STATUSES = np.array(['completed', 'pending', 'failed'])
+EVENT_TYPES = np.array(['login', 'logout', 'page_view', 'click', 'purchase_start', 'purchase_complete', 'search'])
+DEVICE_TYPES = np.array(['desktop', 'mobile', 'tablet'])
+BROWSERS = np.array(['Chrome', 'Firefox', 'Safari', 'Edge'])
+PRODUCT_CATEGORIES = np.array(['Electronics', 'Clothing', 'Home & Garden', 'Sports', 'Books', 'Health & Beauty'])
+
+def _lookup(rng, values, size, p=None):
+    """Draw size items from values as a Categorical over one batch of random codes"""
+    codes = rng.choice(len(values), size, p=p)
+    return pd.Categorical.from_codes(codes.astype(np.int8), categories=values)
+
+def _prefixed_ids(prefix, values, width):
+    """Format an integer array as zero-padded ids such as CUST_000001"""
+    return np.char.mod(f'{prefix}%0{width}d', values)
+
+def _foreign_ids(prefix, keys, width):
+    """Label integer foreign keys by indexing ids formatted once per distinct key value"""
+    return _prefixed_ids(prefix, np.arange(keys.max() + 1), width)[keys]
+
+def _days_ago(rng, low, high, size, fmt):
+    """Format timestamps a random whole number of days in [low, high] before now"""
+    offsets = pd.to_timedelta(rng.integers(low, high + 1, size), unit='D')
+    return (pd.Timestamp.now() - offsets).strftime(fmt)
 
 def generate_customers(num_customers=1000):
     """Generate sample customer data"""
-    np.random.seed(42)
-    random.seed(42)
-    
-    customers = []
-    for i in range(num_customers):
-        customer = {
-            'customer_id': f'CUST_{i+1:06d}',
-            'first_name': random.choice(['John', 'Jane', 'Mike', 'Sarah', 'David', 'Emma', 'Chris', 'Lisa']),
-            'last_name': random.choice(['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis']),
-            'email': f'customer{i+1}@email.com',
-            'phone': f'+1{random.randint(1000000000, 9999999999)}',
-            'registration_date': (datetime.now() - timedelta(days=random.randint(1, 365))).strftime('%Y-%m-%d'),
-            'age': random.randint(18, 80),
-            'city': random.choice(['New York', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix', 'Philadelphia', 'San Antonio', 'San Diego']),
-            'state': random.choice(['CA', 'TX', 'NY', 'FL', 'IL', 'PA', 'OH', 'GA']),
-            'segment': random.choice(['Bronze', 'Silver', 'Gold', 'Platinum']),
-            'is_active': random.choices([True, False], weights=[0.8, 0.2])[0]
-        }
-        customers.append(customer)
+    rng = np.random.default_rng(42)
+    index = np.arange(1, num_customers + 1)
     
-    return pd.DataFrame(customers)
+    return pd.DataFrame({
+        'customer_id': _prefixed_ids('CUST_', index, 6),
+        'first_name': _lookup(rng, FIRST_NAMES, num_customers),
+        'last_name': _lookup(rng, LAST_NAMES, num_customers),
+        'email': np.char.add(np.char.add('customer', index.astype(str)), '@email.com'),
+        'phone': np.char.add('+1', rng.integers(1000000000, 10000000000, num_customers).astype(str)),
+        'registration_date': _days_ago(rng, 1, 365, num_customers, '%Y-%m-%d'),
+        'age': rng.integers(18, 81, num_customers),
+        'city': _lookup(rng, CITIES, num_customers),
+        'state': _lookup(rng, STATES, num_customers),
+        'segment': _lookup(rng, SEGMENTS, num_customers),
+        'is_active': rng.random(num_customers) < 0.8
+    })
 
 def generate_transactions(num_transactions=10000):
     """Generate sample transaction data"""
-    np.random.seed(42)
-    random.seed(42)
-    
-    transactions = []
-    for i in range(num_transactions):
-        transaction = {
-            'transaction_id': f'TXN_{i+1:08d}',
-            'customer_id': f'CUST_{random.randint(1, 1000):06d}',
-            'transaction_date': (datetime.now() - timedelta(days=random.randint(0, 365))).strftime('%Y-%m-%d %H:%M:%S'),
-            'amount': round(random.uniform(10, 1000), 2),
-            'currency': random.choices(['USD', 'EUR', 'GBP'], weights=[0.7, 0.2, 0.1])[0],
-            'transaction_type': random.choice(['purchase', 'refund', 'transfer', 'deposit']),
-            'merchant': random.choice(['Amazon', 'Walmart', 'Target', 'Best Buy', 'Costco', 'Home Depot', 'Starbucks', 'McDonald\'s']),
-            'category': random.choice(['retail', 'food', 'entertainment', 'utilities', 'healthcare', 'transportation']),
-            'payment_method': random.choice(['credit_card', 'debit_card', 'paypal', 'bank_transfer']),
-            'status': random.choices(['completed', 'pending', 'failed'], weights=[0.85, 0.1, 0.05])[0]
-        }
-        transactions.append(transaction)
+    rng = np.random.default_rng(42)
     
-    return pd.DataFrame(transactions)
+    return pd.DataFrame({
+        'transaction_id': _prefixed_ids('TXN_', np.arange(1, num_transactions + 1), 8),
+        'customer_id': _foreign_ids('CUST_', rng.integers(1, 1001, num_transactions), 6),
+        'transaction_date': _days_ago(rng, 0, 365, num_transactions, '%Y-%m-%d %H:%M:%S'),
+        'amount': np.round(rng.uniform(10, 1000, num_transactions), 2),
+        'currency': _lookup(rng, CURRENCIES, num_transactions, p=[0.7, 0.2, 0.1]),
+        'transaction_type': _lookup(rng, TRANSACTION_TYPES, num_transactions),
+        'merchant': _lookup(rng, MERCHANTS, num_transactions),
+        'category': _lookup(rng, TRANSACTION_CATEGORIES, num_transactions),
+        'payment_method': _lookup(rng, PAYMENT_METHODS, num_transactions),
+        'status': _lookup(rng, STATUSES, num_transactions, p=[0.85, 0.1, 0.05])
+    })
 
 def generate_events(num_events=5000):
     """Generate sample event data for user behavior tracking"""
-    np.random.seed(42)
-    random.seed(42)
+    rng = np.random.default_rng(42)
     
-    events = []
-    for i in range(num_events):
-        event = {
-            'event_id': f'EVT_{i+1:08d}',
-            'customer_id': f'CUST_{random.randint(1, 1000):06d}',
-            'timestamp': (datetime.now() - timedelta(days=random.randint(0, 90))).strftime('%Y-%m-%d %H:%M:%S'),
-            'event_type': random.choice(['login', 'logout', 'page_view', 'click', 'purchase_start', 'purchase_complete', 'search']),
-            'page_url': f'/page/{random.randint(1, 50)}',
-            'session_id': f'SESS_{random.randint(1, 2000):06d}',
-            'device_type': random.choices(['desktop', 'mobile', 'tablet'], weights=[0.5, 0.4, 0.1])[0],
-            'browser': random.choice(['Chrome', 'Firefox', 'Safari', 'Edge']),
-            'ip_address': f'{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}',
-            'user_agent': 'Mozilla/5.0 (compatible)'
-        }
-        events.append(event)
+    octets = rng.integers(1, 256, (4, num_events)).astype(str)
+    ip_address = octets[0]
+    for octet in octets[1:]:
+        ip_address = np.char.add(np.char.add(ip_address, '.'), octet)
     
-    return pd.DataFrame(events)
+    return pd.DataFrame({
+        'event_id': _prefixed_ids('EVT_', np.arange(1, num_events + 1), 8),
+        'customer_id': _foreign_ids('CUST_', rng.integers(1, 1001, num_events), 6),
+        'timestamp': _days_ago(rng, 0, 90, num_events, '%Y-%m-%d %H:%M:%S'),
+        'event_type': _lookup(rng, EVENT_TYPES, num_events),
+        'page_url': np.char.add('/page/', rng.integers(1, 51, num_events).astype(str)),
+        'session_id': _foreign_ids('SESS_', rng.integers(1, 2001, num_events), 6),
+        'device_type': _lookup(rng, DEVICE_TYPES, num_events, p=[0.5, 0.4, 0.1]),
+        'browser': _lookup(rng, BROWSERS, num_events),
+        'ip_address': ip_address,
+        'user_agent': 'Mozilla/5.0 (compatible)'
+    })
 
 def generate_products(num_products=500):
     """Generate sample product catalog data"""
-    np.random.seed(42)
-    random.seed(42)
+    rng = np.random.default_rng(42)
     
-    categories = ['Electronics', 'Clothing', 'Home & Garden', 'Sports', 'Books', 'Health & Beauty']
+    index = np.arange(1, num_products + 1)
+    category = _lookup(rng, PRODUCT_CATEGORIES, num_products)
+    category_names = PRODUCT_CATEGORIES[category.codes]
+    dimensions = rng.integers([10, 10, 5], [51, 51, 21], (num_products, 3)).astype(str)
     
-    products = []
-    for i in range(num_products):
-        category = random.choice(categories)
-        product = {
-            'product_id': f'PROD_{i+1:06d}',
-            'name': f'{category} Product {i+1}',
-            'category': category,
-            'subcategory': f'{category} Sub {random.randint(1, 5)}',
-            'price': round(random.uniform(10, 500), 2),
-            'cost': round(random.uniform(5, 300), 2),
-            'stock_quantity': random.randint(0, 1000),
-            'supplier': f'Supplier {random.randint(1, 20)}',
-            'created_date': (datetime.now() - timedelta(days=random.randint(30, 730))).strftime('%Y-%m-%d'),
-            'is_active': random.choices([True, False], weights=[0.9, 0.1])[0],
-            'weight_kg': round(random.uniform(0.1, 10), 2),
-            'dimensions': f'{random.randint(10, 50)}x{random.randint(10, 50)}x{random.randint(5, 20)} cm'
-        }
-        products.append(product)
+    return pd.DataFrame({
+        'product_id': _prefixed_ids('PROD_', index, 6),
+        'name': np.char.add(np.char.add(category_names, ' Product '), index.astype(str)),
+        'category': category,
+        'subcategory': np.char.add(np.char.add(category_names, ' Sub '), rng.integers(1, 6, num_products).astype(str)),
+        'price': np.round(rng.uniform(10, 500, num_products), 2),
+        'cost': np.round(rng.uniform(5, 300, num_products), 2),
+        'stock_quantity': rng.integers(0, 1001, num_products),
+        'supplier': np.char.add('Supplier ', rng.integers(1, 21, num_products).astype(str)),
+        'created_date': _days_ago(rng, 30, 730, num_products, '%Y-%m-%d'),
+        'is_active': rng.random(num_products) < 0.9,
+        'weight_kg': np.round(rng.uniform(0.1, 10, num_products), 2),
+        'dimensions': np.char.add(np.char.add(np.char.add(np.char.add(dimensions[:, 0], 'x'), dimensions[:, 1]), 'x'),
+                                  np.char.add(dimensions[:, 2], ' cm'))
+    })
+
+def save_parquet(df, path, date_columns=()):
+    """Write a dataset as a single snappy-compressed Parquet file with typed timestamps"""
+    df = df.copy()
+    for column in date_columns:
+        df[column] = pd.to_datetime(df[column])
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, compression='snappy')
+
+def save_partitioned_parquet(df, path, date_column):
+    """Write a dataset as Parquet partitioned by the month of date_column"""
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    
+    df = df.copy()
+    # Reading partitions back groups rows by month; the row number lets readers restore file order
+    df['row_number'] = np.arange(len(df), dtype=np.int64)
+    df[date_column] = pd.to_datetime(df[date_column])
+    df['month'] = df[date_column].dt.to_period('M').astype(str)
+    df.to_parquet(path, engine='pyarrow', partition_cols=['month'], index=False)
+
+def save_numpy_columns(df, path, columns, date_columns=()):
+    """Write each column as its own .npy file so readers can memory-map them"""
+    os.makedirs(path, exist_ok=True)
     
-    return pd.DataFrame(products)
+    for column in columns:
+        if column in date_columns:
+            values = pd.to_datetime(df[column]).to_numpy(dtype='datetime64[ns]')
+        elif df[column].dtype == object:
+            values = df[column].to_numpy(dtype=str)
+        else:
+            values = df[column].to_numpy()
+        
+        # Swap in a new inode: truncating a file that API workers have memory-mapped
+        # would make their next read of the mapping fault with SIGBUS
+        column_path = os.path.join(path, f'{column}.npy')
+        tmp_path = f'{column_path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, values)
+        os.replace(tmp_path, column_path)
 
 if __name__ == "__main__":
     # Generate all datasets
@@ -117,6 +178,22 @@ if __name__ == "__main__":
     events_df.to_csv('events.csv', index=False)
     products_df.to_csv('products.csv', index=False)
     
+    # Binary columnar copies loaded by db_setup without re-parsing the CSV text
+    save_parquet(customers_df, 'customers.parquet', ('registration_date',))
+    save_parquet(transactions_df, 'transactions.parquet', ('transaction_date',))
+    save_parquet(events_df, 'events.parquet', ('timestamp',))
+    save_parquet(products_df, 'products.parquet', ('created_date',))
+    
+    # Columnar copy of the transactions for the API, one partition per month
+    save_partitioned_parquet(transactions_df, 'transactions_parquet', 'transaction_date')
+    
+    # Memory-mappable columns shared through the page cache by all API workers
+    save_numpy_columns(
+        transactions_df, 'transactions_npy',
+        ['transaction_id', 'customer_id', 'transaction_date', 'amount'],
+        date_columns=('transaction_date',)
+    )
+    
     # Also save some data as JSON for API simulation
     sample_customers = customers_df.head(10).to_dict('records')
     with open('sample_customers.json', 'w') as f: